@@ -2,36 +2,49 @@ import argparse
 import json
 import math
 import os
+import re
+
+_BENCH_RE = re.compile(r"bench_.+\.json\Z")
 
 def load(path):
   with open(path, "r", encoding="utf-8") as f:
     return json.load(f)
 
-def latest_history(dirpath):
-  files = [f for f in os.listdir(dirpath) if f.startswith("bench_") and f.endswith(".json")]
-  if not files:
-    raise SystemExit("No history files")
-  files.sort()
-  return os.path.join(dirpath, files[-1])
+def _bench_files(dirpath):
+  # scandir yields name+path in one getdents pass; one precompiled regex
+  # match per entry replaces the two str method calls
+  with os.scandir(dirpath) as it:
+    return sorted(e.path for e in it if e.is_file() and _BENCH_RE.match(e.name))
+
+def rise(o, n):
+  # Folded guards: division raises on None/zero, isfinite catches the rest
+  try:
+    r = (n / o - 1.0) * 100.0
+  except (TypeError, ZeroDivisionError):
+    return 0.0
+  return r if math.isfinite(r) and o > 0 else 0.0
 
 def main():
   ap = argparse.ArgumentParser()
   ap.add_argument("--threshold", type=float, default=10.0)
   ap.add_argument("--history", default="tests/benchmarks/history")
   args = ap.parse_args()
-  latest = load(latest_history(args.history))
-  prev_files = [f for f in os.listdir(args.history) if f.startswith("bench_") and f.endswith(".json")]
-  prev_files.sort()
+  prev_files = _bench_files(args.history)
+  if not prev_files:
+    raise SystemExit("No history files")
+  latest = load(prev_files[-1])
   if len(prev_files) < 2:
     print("Insufficient history, skipping gate")
     return 0
-  prev = load(os.path.join(args.history, prev_files[-2]))
-  scales = set(s["scale"] for s in prev["results"]) & set(s["scale"] for s in latest["results"])
+  prev = load(prev_files[-2])
+  prev_by = {r["scale"]: r for r in prev["results"]}
+  latest_by = {r["scale"]: r for r in latest["results"]}
+  scales = prev_by.keys() & latest_by.keys()
   bad = []
   keys = ["dict", "dict-hot", "string-builder", "string-scan"]
   for s in sorted(scales):
-    ro = next(r for r in prev["results"] if r["scale"] == s)
-    rn = next(r for r in latest["results"] if r["scale"] == s)
+    ro = prev_by[s]
+    rn = latest_by[s]
     for k in keys:
       po = ro["cases"].get(k, {}).get("py")
       pn = rn["cases"].get(k, {}).get("py")
@@ -39,10 +52,6 @@ def main():
       nn = rn["cases"].get(k, {}).get("node")
       xo = ro["cases"].get(k, {}).get("xu")
       xn = rn["cases"].get(k, {}).get("xu")
-      def rise(o, n):
-        if o is None or n is None or not math.isfinite(o) or not math.isfinite(n) or o <= 0:
-          return 0.0
-        return (n / o - 1.0) * 100.0
       rp, rn_, rx = rise(po, pn), rise(no, nn), rise(xo, xn)
       if rp > args.threshold or rn_ > args.threshold or rx > args.threshold:
         bad.append((s, k, rp, rn_, rx))
@@ -40,12 +40,16 @@ if [ ! -x "$XU_BIN" ]; then
   cargo build -q -p xu_cli --bin xu --release || true
 fi
 
+# JSON lines are tagged with their origin (PY/ND/XU) so consumers can
+# dispatch per line without section state; headers remain for old parsers.
+# Plain sed (no GNU -u): sections run serially, so flushing at each child's
+# EOF preserves ordering, and BSD/macOS sed has no -u.
 echo "Python:"
-if ! WARMS="${WARMS:-0}" REPEAT="${REPEAT:-1}" run_with_timeout python3 tests/benchmarks/python/bench.py --scale "$SCALE"; then
+if ! WARMS="${WARMS:-0}" REPEAT="${REPEAT:-1}" run_with_timeout python3 tests/benchmarks/python/bench.py --scale "$SCALE" | sed 's/^{/PY {/'; then
   echo "Python benchmark timed out or failed" >&2
 fi
 echo "Node.js:"
-if ! WARMS="${WARMS:-0}" REPEAT="${REPEAT:-1}" run_with_timeout node tests/benchmarks/node/bench.js --scale "$SCALE"; then
+if ! WARMS="${WARMS:-0}" REPEAT="${REPEAT:-1}" run_with_timeout node tests/benchmarks/node/bench.js --scale "$SCALE" | sed 's/^{/ND {/'; then
   echo "Node benchmark timed out or failed" >&2
 fi
 
@@ -68,4 +72,4 @@ BENCH_SCALE="$SCALE" run_with_timeout "$XU_BIN" run --no-diags "tests/benchmarks
     head -20 "$ERR_XU" >&2
   fi
 }
-cat "$OUT_XU"
+sed 's/^{/XU {/' "$OUT_XU"
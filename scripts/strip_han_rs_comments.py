@@ -0,0 +1,56 @@
+"""Strip Han-character line comments from Rust sources under crates/.
+
+Only whole-line `//` comments (including `///` and `//!` doc comments) that
+contain CJK characters are removed; code lines are never touched.
+"""
+import argparse
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# CJK punctuation, unified ideographs, and fullwidth forms
+HAN_RE = re.compile(r"[　-〿一-鿿＀-￯]")
+
+# UTF-8 lead bytes of the ranges above (3-byte sequences starting 0xE3-0xE9/0xEF).
+# Searching the raw bytes first lets pure-ASCII files — the overwhelming common
+# case in a Rust tree — return without a UTF-8 decode or per-line scan.
+_HAN_LEAD_RE = re.compile(rb"[\xe3-\xe9\xef][\x80-\xbf]{2}")
+
+
+def process_file(path):
+  raw = path.read_bytes()
+  if _HAN_LEAD_RE.search(raw) is None:
+    return False, 0
+  text = raw.decode("utf-8")
+  kept = []
+  removed = 0
+  for line in text.splitlines(keepends=True):
+    if line.lstrip().startswith("//") and HAN_RE.search(line):
+      removed += 1
+      continue
+    kept.append(line)
+  if removed == 0:
+    return False, 0
+  path.write_text("".join(kept), encoding="utf-8")
+  return True, removed
+
+
+def main():
+  ap = argparse.ArgumentParser()
+  ap.add_argument("--root", default="crates")
+  args = ap.parse_args()
+  paths = list(Path(args.root).rglob("*.rs"))
+  changed_files = 0
+  removed_lines = 0
+  # Files are independent; fan out across cores. The ASCII fast path in
+  # process_file keeps the per-task cost tiny for untouched files.
+  with ProcessPoolExecutor() as ex:
+    for changed, removed in ex.map(process_file, paths, chunksize=32):
+      if changed:
+        changed_files += 1
+        removed_lines += removed
+  print(f"changed_files={changed_files} removed_lines={removed_lines}")
+
+
+if __name__ == "__main__":
+  main()
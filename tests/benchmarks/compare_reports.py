@@ -7,9 +7,14 @@ def load(path):
     return json.load(f)
 
 def ratio(a, b):
-  if not math.isfinite(a) or not math.isfinite(b) or b == 0:
+  # One division with the guards folded into the exception/result check,
+  # instead of three isfinite/zero branches per call; None inputs (case
+  # missing from one report) now degrade to nan instead of raising.
+  try:
+    r = a / b
+  except (TypeError, ZeroDivisionError):
     return float("nan")
-  return a / b
+  return r if math.isfinite(r) else float("nan")
 
 def main():
   ap = argparse.ArgumentParser()
@@ -18,12 +23,14 @@ def main():
   args = ap.parse_args()
   old = load(args.old)
   new = load(args.new)
-  scales = set(s["scale"] for s in old["results"]) & set(s["scale"] for s in new["results"])
+  old_by = {r["scale"]: r for r in old["results"]}
+  new_by = {r["scale"]: r for r in new["results"]}
+  scales = old_by.keys() & new_by.keys()
   print("| scale | case | py Δ% | node Δ% | xu Δ% |")
   print("|---:|---|---:|---:|---:|")
   for s in sorted(scales):
-    ro = next(r for r in old["results"] if r["scale"] == s)
-    rn = next(r for r in new["results"] if r["scale"] == s)
+    ro = old_by[s]
+    rn = new_by[s]
     cases = set(ro["cases"].keys()) | set(rn["cases"].keys())
     for c in sorted(cases):
       po = ro["cases"].get(c, {}).get("py")
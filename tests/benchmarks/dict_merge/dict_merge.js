@@ -0,0 +1,27 @@
+const processArgs = (() => {
+  const out = { size: 200, iters: 200000 };
+  for (let i = 2; i < process.argv.length; i++) {
+    const a = process.argv[i];
+    if (a === "--size") out.size = parseInt(process.argv[++i], 10);
+    if (a === "--iters") out.iters = parseInt(process.argv[++i], 10);
+  }
+  return out;
+})();
+
+function main() {
+  const size = processArgs.size;
+  const iters = processArgs.iters;
+  const A = {};
+  const B = {};
+  for (let i = 0; i < size; i++) {
+    A["k" + i] = i;
+    B["k" + i] = i + 1;
+  }
+  for (let j = 0; j < 2000; j++) Object.assign(A, B);
+  const t0 = process.hrtime.bigint();
+  for (let j = 0; j < iters; j++) Object.assign(A, B);
+  const total = Number(process.hrtime.bigint() - t0);
+  console.log(`lang=node iters=${iters} total_ns=${total} per_ns=${Math.floor(total / iters)}`);
+}
+
+main();
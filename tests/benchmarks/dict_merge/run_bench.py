@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, "..", "..", ".."))
+
+# Unanchored: parse_samples finditers the whole output, one match per
+# lang= line (the python bench emits one line per variant)
+LINE_RE = re.compile(r"lang=([a-zA-Z0-9_+-]+) iters=(\d+) total_ns=(\d+) per_ns=(\d+)")
+
+
+def sh(cmd, env=None):
+    p = subprocess.run(cmd, capture_output=True, text=True, cwd=ROOT, env=env)
+    if p.returncode != 0:
+        raise RuntimeError(f"command failed ({p.returncode}): {' '.join(cmd)}\n{p.stderr}")
+    return p.stdout
+
+
+def parse_samples(output):
+    # The python bench emits one line per variant; collect every match in a
+    # single linear regex pass (still no splitlines()/strip() sweep).
+    samples = [
+        {
+            "lang": m.group(1),
+            "iters": int(m.group(2)),
+            "total_ns": int(m.group(3)),
+            "per_ns": int(m.group(4)),
+        }
+        for m in LINE_RE.finditer(output)
+    ]
+    if not samples:
+        raise RuntimeError(f"no bench samples in output: {output[-200:]!r}")
+    return samples
+
+
+def run_many(cmd, rounds, env=None):
+    by_lang = {}
+    for _ in range(rounds):
+        for s in parse_samples(sh(cmd, env=env)):
+            by_lang.setdefault(s["lang"], []).append(s)
+    return by_lang
+
+
+_ENV_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "xu_bench_env.json")
+
+
+def _tool_mtime(name):
+    path = shutil.which(name)
+    try:
+        return os.path.getmtime(path) if path else 0.0
+    except OSError:
+        return 0.0
+
+
+def env_info():
+    # Version strings only change when toolchains change; key the cached
+    # values on the tool binaries' mtimes to skip three process spawns per run.
+    key = [_tool_mtime("cargo"), _tool_mtime("rustc"), _tool_mtime("node"),
+           platform.platform()]
+    try:
+        with open(_ENV_CACHE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("key") == key and "info" in cached:
+            return cached["info"]
+    except (OSError, ValueError):
+        pass
+    info = {
+        "cargo": sh(["cargo", "--version"]).strip(),
+        "rustc": sh(["rustc", "--version"]).strip(),
+        "node": sh(["node", "--version"]).strip(),
+    }
+    try:
+        os.makedirs(os.path.dirname(_ENV_CACHE), exist_ok=True)
+        with open(_ENV_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "info": info}, f)
+    except OSError:
+        pass
+    return info
+
+
+def summarize(samples):
+    # One sort + one accumulation pass instead of three statistics.* calls
+    # that each re-walk (and median re-sort) the list. Sample stdev (n-1),
+    # matching the stats helpers in parse_report and py_node_report.
+    v = sorted(s["per_ns"] for s in samples)
+    n = len(v)
+    med = v[n // 2] if n % 2 else 0.5 * (v[n // 2 - 1] + v[n // 2])
+    mean = sum(v) / n
+    var = sum((x - mean) ** 2 for x in v) / (n - 1) if n > 1 else 0.0
+    return {"min": v[0], "median": med, "mean": mean, "stdev": var ** 0.5}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=200)
+    ap.add_argument("--iters", type=int, default=200000)
+    ap.add_argument("--rounds", type=int, default=7)
+    args = ap.parse_args()
+
+    sh(["cargo", "build", "-q", "-p", "xu_cli", "--bin", "xu", "--release"])
+    xu_bin = os.path.join(ROOT, "target", "release", "xu")
+
+    info = env_info()
+    print(f"# dict-merge size={args.size} iters={args.iters} rounds={args.rounds}")
+    print(f"# {platform.platform()}")
+    print(f"# {info['cargo']} / {info['rustc']} / python {platform.python_version()} / node {info['node']}")
+
+    py_cmd = [sys.executable, os.path.join(HERE, "dict_merge.py"),
+              "--size", str(args.size), "--iters", str(args.iters)]
+    node_cmd = ["node", os.path.join(HERE, "dict_merge.js"),
+                "--size", str(args.size), "--iters", str(args.iters)]
+    xu_cmd = [xu_bin, "run", "--no-diags", os.path.join(HERE, "dict_merge.xu")]
+    xu_env = dict(os.environ,
+                  DICT_MERGE_SIZE=str(args.size), DICT_MERGE_ITERS=str(args.iters))
+
+    # Each sample spends ~all wall-time in the child process, so the three
+    # languages can run concurrently; rounds within a language stay sequential.
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        f_py = ex.submit(run_many, py_cmd, args.rounds)
+        f_node = ex.submit(run_many, node_cmd, args.rounds)
+        f_xu = ex.submit(run_many, xu_cmd, args.rounds, env=xu_env)
+        samples_py, samples_node, samples_xu = f_py.result(), f_node.result(), f_xu.result()
+
+    by_lang = {**samples_py, **samples_node, **samples_xu}
+    for lang, samples in by_lang.items():
+        s = summarize(samples)
+        print(f"{lang}: median={s['median']:.0f}ns/op min={s['min']}ns/op "
+              f"mean={s['mean']:.0f}ns/op stdev={s['stdev']:.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,18 @@
 import argparse
 
-def gen_xu_assign(n: int) -> str:
-    # Xu uses Chinese terminator ； in benchmarks; use it here
-    lines = [f"a{i} 为 {i}；" for i in range(n)]
-    return "\n".join(lines) + "\n"
+# One precompiled format template per line, streamed straight to the file so
+# the whole source is never held in memory as a list of small strings. The
+# current parser takes `let` bindings; the old `a0 为 0；` form is rejected
+# by the lexer.
+_LINE_FMT = "let a{0} = {0}\n".format
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--scale", type=int, default=5000)
     ap.add_argument("--out", type=str, required=True)
     args = ap.parse_args()
-    s = gen_xu_assign(args.scale)
     with open(args.out, "w", encoding="utf-8") as f:
-        f.write(s)
+        f.writelines(_LINE_FMT(i) for i in range(args.scale))
 
 if __name__ == "__main__":
     main()